@@ -7,16 +7,94 @@ This module provides REST endpoints for:
 - Arithmetic progression analysis
 """
 
-from fastapi import FastAPI, HTTPException, Path, Query
-from pydantic import BaseModel, Field, validator
-from typing import List, Union
-import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from anyio.to_thread import current_default_thread_limiter
+from fastapi import FastAPI, HTTPException, Path, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field
+from typing import AsyncIterator, List, Literal, Optional, Union
+import asyncio
+import multiprocessing
 import os
 
-# Add the project root to the Python path to import prime module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+
+from prime.nt import HAVE_NUMBA, is_prime_64, factorize, prime_run_length, MAX_64BIT
+
+# Worker threads shared by the sync, CPU-bound endpoints
+THREADPOOL_SIZE = 200
+
+# Without the compiled kernels, factorizations above this size run in a
+# separate process, since pure-Python Pollard's Rho on large semiprimes would
+# otherwise hold the GIL for the whole worker. The uint64 kernel finishes any
+# 64-bit input in about a millisecond, well under a pool round trip, so with
+# numba every factorization stays in the threadpool.
+PROCESS_POOL_THRESHOLD = 1 << 48
+
+# Processes per server worker; servers already run one worker per core, so
+# keep this small to avoid cpu_count^2 factorization processes per host
+PROCESS_POOL_SIZE = int(os.getenv("FACTOR_POOL_WORKERS", "2"))
+
+# Every endpoint result is a pure function of its inputs, so clients and
+# CDNs may cache responses indefinitely
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Create the factorization process pool on first use (after server fork).
+
+    Children are started by a forkserver (spawn where unavailable) rather
+    than forked from this process, which already runs the threadpool.
+    """
+    global _process_pool
+    if _process_pool is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            method = "forkserver"
+        else:
+            method = "spawn"
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PROCESS_POOL_SIZE,
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _process_pool
+
+
+async def _factorize_in_pool(n: int) -> List[int]:
+    """
+    Factorize n in the process pool, recovering from a broken pool.
+
+    A pool whose child died (e.g. OOM-killed) rejects all further work, so
+    it is discarded and the call retried once on a fresh pool; if that
+    fails too, the factorization runs in the threadpool instead.
+    """
+    global _process_pool
+    loop = asyncio.get_running_loop()
+    for _ in range(2):
+        pool = _get_process_pool()
+        try:
+            return await loop.run_in_executor(pool, factorize, n)
+        except BrokenProcessPool:
+            if _process_pool is pool:
+                _process_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+    return await run_in_threadpool(factorize, n)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Size the threadpool and shut down the process pool on exit."""
+    global _process_pool
+    current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+    if _process_pool is not None:
+        _process_pool.shutdown()
+        _process_pool = None
 
-from prime.nt import is_prime_64, factorize, prime_run_length, MAX_64BIT
 
 app = FastAPI(
     title="Prime Math API",
@@ -56,6 +134,7 @@ app = FastAPI(
     },
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
     openapi_tags=[
         {
             "name": "health",
@@ -83,13 +162,12 @@ class PrimeResponse(BaseModel):
     number: int = Field(..., description="The number that was tested")
     is_prime: bool = Field(..., description="Whether the number is prime")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "number": 97,
-                "is_prime": True
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "number": 97,
+            "is_prime": True
         }
+    })
 
 
 class FactorResponse(BaseModel):
@@ -98,14 +176,13 @@ class FactorResponse(BaseModel):
     factors: List[int] = Field(..., description="List of prime factors (with repetition)")
     factor_count: int = Field(..., description="Total number of prime factors")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "number": 60,
-                "factors": [2, 2, 3, 5],
-                "factor_count": 4
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "number": 60,
+            "factors": [2, 2, 3, 5],
+            "factor_count": 4
         }
+    })
 
 
 class ProgressionResponse(BaseModel):
@@ -115,15 +192,14 @@ class ProgressionResponse(BaseModel):
     length: int = Field(..., description="Number of consecutive primes found")
     primes: List[int] = Field(..., description="List of consecutive primes in the progression")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "start": 3,
-                "diff": 2,
-                "length": 5,
-                "primes": [3, 5, 7, 11, 13]
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "start": 3,
+            "diff": 2,
+            "length": 3,
+            "primes": [3, 5, 7]
         }
+    })
 
 
 class ErrorResponse(BaseModel):
@@ -132,19 +208,23 @@ class ErrorResponse(BaseModel):
     details: str = Field(None, description="Additional error details")
 
 
-def validate_64bit_integer(value: int, param_name: str) -> int:
-    """Validate that a value is within 64-bit integer range."""
-    if value < 0:
-        raise HTTPException(
-            status_code=400,
-            detail=f"{param_name} must be non-negative, got {value}"
-        )
-    if value > MAX_64BIT:
-        raise HTTPException(
-            status_code=400,
-            detail=f"{param_name} exceeds 64-bit range (max: {MAX_64BIT}), got {value}"
-        )
-    return value
+def _check_not_modified(
+    request: Request, response: Response, etag: str
+) -> Optional[Response]:
+    """
+    Attach caching headers and short-circuit conditional requests.
+
+    Returns:
+        A 304 response if the client's If-None-Match matches etag, otherwise
+        None after setting the headers on the endpoint's response
+    """
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in client_tags or etag in client_tags:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
 
 
 @app.get("/")
@@ -178,9 +258,11 @@ async def health_check():
 
 
 @app.get("/prime/{n}", response_model=PrimeResponse, tags=["primality"])
-async def check_prime(
-    n: int = Path(..., description="Integer to test for primality", ge=0)
-) -> PrimeResponse:
+def check_prime(
+    request: Request,
+    response: Response,
+    n: int = Path(..., description="Integer to test for primality", ge=0, le=MAX_64BIT)
+) -> Union[PrimeResponse, Response]:
     """
     Check if a number is prime using deterministic Miller-Rabin algorithm.
 
@@ -194,12 +276,13 @@ async def check_prime(
         PrimeResponse with the number and whether it's prime
 
     Raises:
-        HTTPException: If n is negative or exceeds 64-bit range
+        RequestValidationError: 422 if n is negative or exceeds 64-bit range
     """
-    try:
-        # Validate input range
-        validate_64bit_integer(n, "n")
+    not_modified = _check_not_modified(request, response, f'"{n:x}"')
+    if not_modified is not None:
+        return not_modified
 
+    try:
         # Check primality
         is_prime = is_prime_64(n)
 
@@ -211,31 +294,69 @@ async def check_prime(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@app.get("/factor/{n}", response_model=FactorResponse, tags=["factorization"])
+@app.get(
+    "/factor/{n}",
+    response_model=FactorResponse,
+    tags=["factorization"],
+    responses={
+        200: {
+            "content": {
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"}
+                }
+            },
+            "description": "JSON by default; with format=binary, the factors as "
+                           "packed little-endian uint64 values",
+        }
+    },
+)
 async def get_factors(
-    n: int = Path(..., description="Integer to factorize", ge=0)
-) -> FactorResponse:
+    request: Request,
+    response: Response,
+    n: int = Path(..., description="Integer to factorize", ge=0, le=MAX_64BIT),
+    response_format: Literal["json", "binary"] = Query(
+        "json", alias="format", description="Response encoding: json or binary"
+    )
+) -> Union[FactorResponse, Response]:
     """
     Get prime factorization of a number using hybrid algorithm.
 
     Uses trial division for small primes and Pollard's Rho with Brent optimization
-    for larger factors. Returns all prime factors with repetition.
+    for larger factors. Returns all prime factors with repetition. Without numba,
+    inputs above 2^48 are factorized in a process pool; everything else runs
+    in the threadpool.
 
     Args:
         n: Non-negative integer to factorize (0 ≤ n ≤ 2^64-1)
+        response_format: "binary" returns the factors as raw little-endian
+            uint64 values (8 bytes each) instead of JSON
 
     Returns:
-        FactorResponse with the number, factors list, and factor count
+        FactorResponse with the number, factors list, and factor count, or an
+        application/octet-stream response in binary format
 
     Raises:
-        HTTPException: If n is negative or exceeds 64-bit range
+        RequestValidationError: 422 if n is negative or exceeds 64-bit range
     """
-    try:
-        # Validate input range
-        validate_64bit_integer(n, "n")
+    binary = response_format == "binary"
+    etag = f'"{n:x}-bin"' if binary else f'"{n:x}"'
+    not_modified = _check_not_modified(request, response, etag)
+    if not_modified is not None:
+        return not_modified
 
+    try:
         # Get prime factorization
-        factors = factorize(n)
+        if not HAVE_NUMBA and n > PROCESS_POOL_THRESHOLD:
+            factors = await _factorize_in_pool(n)
+        else:
+            factors = await run_in_threadpool(factorize, n)
+
+        if binary:
+            return Response(
+                content=np.asarray(factors, dtype="<u8").tobytes(),
+                media_type="application/octet-stream",
+                headers={"Cache-Control": CACHE_CONTROL, "ETag": etag},
+            )
 
         return FactorResponse(
             number=n,
@@ -250,11 +371,13 @@ async def get_factors(
 
 
 @app.get("/progression/{start}/{diff}", response_model=ProgressionResponse, tags=["progressions"])
-async def get_prime_progression(
-    start: int = Path(..., description="First term of arithmetic sequence", ge=0),
-    diff: int = Path(..., description="Common difference (must be positive)", gt=0),
+def get_prime_progression(
+    request: Request,
+    response: Response,
+    start: int = Path(..., description="First term of arithmetic sequence", ge=0, le=MAX_64BIT),
+    diff: int = Path(..., description="Common difference (must be positive)", gt=0, le=MAX_64BIT),
     max_terms: int = Query(1000, description="Maximum number of terms to check", ge=1, le=10000)
-) -> ProgressionResponse:
+) -> Union[ProgressionResponse, Response]:
     """
     Find consecutive primes in arithmetic progression.
 
@@ -270,25 +393,14 @@ async def get_prime_progression(
         ProgressionResponse with start, diff, length, and list of consecutive primes
 
     Raises:
-        HTTPException: If parameters are invalid or exceed 64-bit range
+        RequestValidationError: 422 if parameters are invalid or exceed 64-bit range
     """
-    try:
-        # Validate input ranges
-        validate_64bit_integer(start, "start")
-        validate_64bit_integer(diff, "diff")
-
-        if diff <= 0:
-            raise HTTPException(
-                status_code=400,
-                detail=f"diff must be positive, got {diff}"
-            )
-
-        if max_terms < 1 or max_terms > 10000:
-            raise HTTPException(
-                status_code=400,
-                detail=f"max_terms must be between 1 and 10000, got {max_terms}"
-            )
+    etag = f'"{start:x}-{diff:x}-{max_terms:x}"'
+    not_modified = _check_not_modified(request, response, etag)
+    if not_modified is not None:
+        return not_modified
 
+    try:
         # Find prime progression
         length, primes = prime_run_length(start, diff, max_terms)
 
@@ -299,9 +411,6 @@ async def get_prime_progression(
             primes=primes
         )
 
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
     except (TypeError, ValueError) as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -310,4 +419,19 @@ async def get_prime_progression(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+
+    if os.getenv("DEV"):
+        # Development: single process with auto-reload
+        uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # Production: uvloop + httptools, one worker process per core. For
+        # gunicorn, use: gunicorn app.main:app -k uvicorn.workers.UvicornWorker
+        #                -w $(nproc) --preload
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WORKERS", os.cpu_count() or 1)),
+        )
@@ -0,0 +1,281 @@
+"""
+Compiled 64-bit kernels for the number theory module.
+
+Numba-jitted versions of the Miller-Rabin hot loop working directly on
+``uint64`` values with Montgomery multiplication, so each modular squaring
+is a few machine multiplies and shifts instead of PyLong arithmetic.
+
+Numba has no native 128-bit integer type, so the full 64x64 -> 128 bit
+product is assembled from 32-bit limbs. Reduction uses the subtractive
+form of Montgomery REDC with ``ninv = n^{-1} mod 2^64``, which never needs
+more than 64 bits of intermediate state even for moduli close to 2^64.
+
+The same Montgomery path is used for every modulus size. A float64
+quotient-estimate reduction for n < 2^49 (exact there, since the estimate
+is off by at most one) measured about 1.5x slower per round than
+Montgomery form, because the int/float conversions sit on the critical
+path of every squaring.
+
+This module requires numba; ``prime.nt`` falls back to pure Python when
+the import fails.
+
+Reference:
+- Montgomery multiplication: Montgomery (1985)
+"""
+
+import numpy as np
+from numba import njit
+
+_U32_MASK = np.uint64(0xFFFFFFFF)
+_U32_SHIFT = np.uint64(32)
+_ZERO = np.uint64(0)
+_ONE = np.uint64(1)
+_TWO = np.uint64(2)
+
+
+@njit("uint64(uint64, uint64)", cache=True)
+def _mul_hi(a, b):
+    """High 64 bits of the 128-bit product a * b."""
+    a_lo = a & _U32_MASK
+    a_hi = a >> _U32_SHIFT
+    b_lo = b & _U32_MASK
+    b_hi = b >> _U32_SHIFT
+
+    lo_lo = a_lo * b_lo
+    lo_hi = a_lo * b_hi
+    hi_lo = a_hi * b_lo
+    hi_hi = a_hi * b_hi
+
+    mid = (lo_lo >> _U32_SHIFT) + (lo_hi & _U32_MASK) + (hi_lo & _U32_MASK)
+    return hi_hi + (lo_hi >> _U32_SHIFT) + (hi_lo >> _U32_SHIFT) + (mid >> _U32_SHIFT)
+
+
+@njit("uint64(uint64)", cache=True)
+def _mont_setup(n):
+    """
+    Compute n^{-1} mod 2^64 for odd n by Newton (Hensel) lifting.
+
+    n * n == 1 (mod 8) gives 3 correct bits to start with; each iteration
+    doubles them, so 5 iterations reach 96 >= 64 bits.
+    """
+    inv = n
+    for _ in range(5):
+        inv *= _TWO - n * inv
+    return inv
+
+
+@njit("uint64(uint64, uint64, uint64, uint64)", cache=True)
+def _mont_mul(a, b, n, ninv):
+    """Montgomery product a * b * 2^-64 mod n for a, b < n."""
+    lo = a * b
+    hi = _mul_hi(a, b)
+    m = lo * ninv
+    mn_hi = _mul_hi(m, n)
+    # lo - low64(m * n) == 0 by construction, so only the high words remain
+    if hi < mn_hi:
+        return hi - mn_hi + n
+    return hi - mn_hi
+
+
+@njit("uint64(uint64)", cache=True)
+def _mont_r2(n):
+    """Compute R^2 mod n (R = 2^64) by 64 modular doublings of R mod n."""
+    x = (_ZERO - n) % n
+    for _ in range(64):
+        # x + x mod n without overflowing 64 bits
+        if x >= n - x:
+            x = x - (n - x)
+        else:
+            x = x + x
+    return x
+
+
+@njit("uint64(uint64, uint64, uint64, uint64, uint64)", cache=True)
+def _mont_pow(base, d, n, ninv, r2):
+    """Compute base^d mod n, returned in Montgomery form."""
+    result = (_ZERO - n) % n  # 1 in Montgomery form (R mod n)
+    b = _mont_mul(base % n, r2, n, ninv)
+    while d > _ZERO:
+        if d & _ONE:
+            result = _mont_mul(result, b, n, ninv)
+        b = _mont_mul(b, b, n, ninv)
+        d >>= _ONE
+    return result
+
+
+@njit("boolean(uint64, uint64, uint64, uint64, uint64, uint64, int64)", cache=True)
+def _mr_round_mont(n, base, ninv, r2, one, d, r):
+    """
+    Miller-Rabin round given the per-modulus constants of n.
+
+    ``one`` is R mod n (1 in Montgomery form) and n - 1 == d * 2^r with d
+    odd; all of them depend only on n, so callers testing several bases
+    compute them once.
+    """
+    minus_one = n - one
+
+    x = _mont_pow(base, d, n, ninv, r2)
+    if x == one or x == minus_one:
+        return True
+
+    for _ in range(r - 1):
+        x = _mont_mul(x, x, n, ninv)
+        if x == minus_one:
+            return True
+        if x == one:
+            return False
+
+    return False
+
+
+@njit("boolean(uint64, uint64)", cache=True)
+def _mr_round(n, base):
+    """
+    Single Miller-Rabin round for odd n >= 3 and 2 <= base < n.
+
+    Mirrors ``prime.nt._miller_rabin_test`` with all arithmetic kept in
+    Montgomery form.
+    """
+    d = n - _ONE
+    r = 0
+    while (d & _ONE) == _ZERO:
+        d >>= _ONE
+        r += 1
+
+    return _mr_round_mont(
+        n, base, _mont_setup(n), _mont_r2(n), (_ZERO - n) % n, d, r
+    )
+
+
+@njit("boolean(uint64, uint64[::1])", cache=True)
+def _mr_all_bases(n, bases):
+    """
+    Miller-Rabin over every base for odd n >= 3, stopping at the first failure.
+
+    The Montgomery constants and the n - 1 == d * 2^r split are computed
+    once and shared by all rounds. Bases divisible by n count as passes,
+    matching ``prime.nt._miller_rabin_test``.
+    """
+    ninv = _mont_setup(n)
+    r2 = _mont_r2(n)
+    one = (_ZERO - n) % n
+
+    d = n - _ONE
+    r = 0
+    while (d & _ONE) == _ZERO:
+        d >>= _ONE
+        r += 1
+
+    for i in range(bases.shape[0]):
+        base = bases[i] % n
+        if base == _ZERO:
+            continue
+        if not _mr_round_mont(n, base, ninv, r2, one, d, r):
+            return False
+
+    return True
+
+
+@njit("uint64(uint64, uint64, uint64)", cache=True)
+def _add_mod(a, b, n):
+    """Compute a + b mod n for a, b < n without overflowing 64 bits."""
+    if a >= n - b:
+        return a - (n - b)
+    return a + b
+
+
+@njit("uint64(uint64, uint64)", cache=True)
+def _abs_diff(a, b):
+    """Absolute difference |a - b| of two uint64 values."""
+    if a > b:
+        return a - b
+    return b - a
+
+
+@njit("uint64(uint64, uint64)", cache=True)
+def _binary_gcd(a, b):
+    """Stein's binary GCD on uint64 values."""
+    if a == _ZERO:
+        return b
+    if b == _ZERO:
+        return a
+
+    shift = _ZERO
+    while ((a | b) & _ONE) == _ZERO:
+        a >>= _ONE
+        b >>= _ONE
+        shift += _ONE
+    while (a & _ONE) == _ZERO:
+        a >>= _ONE
+
+    while b != _ZERO:
+        while (b & _ONE) == _ZERO:
+            b >>= _ONE
+        if a > b:
+            a, b = b, a
+        b -= a
+
+    return a << shift
+
+
+@njit("uint64(uint64, uint64, uint64, int64, int64)", cache=True)
+def _pollard_brent_u64(n, y0, c, batch, max_iterations):
+    """
+    One Pollard-Brent attempt on odd composite n with f(y) = y^2 + c.
+
+    Same cycle detection and batched GCD as ``prime.nt._pollard_rho_brent``,
+    with x, y and the accumulated product q kept in Montgomery form. Since
+    R = 2^64 is coprime to odd n, gcd(q * R^k, n) == gcd(q, n) and no
+    conversion back is needed. When a batch overshoots to gcd == n, the
+    last batch is replayed one step at a time to recover the factor.
+
+    Returns:
+        gcd found by the attempt: a non-trivial factor, 1 if the iteration
+        budget ran out, or n if this (y0, c) pair degenerated
+    """
+    ninv = _mont_setup(n)
+    r2 = _mont_r2(n)
+
+    y = _mont_mul(y0 % n, r2, n, ninv)
+    c_m = _mont_mul(c % n, r2, n, ninv)
+    q = (_ZERO - n) % n  # 1 in Montgomery form
+    x = y
+    ys = y
+    d = _ONE
+
+    r = 1
+    iteration = 0
+
+    while d == _ONE and iteration < max_iterations:
+        x = y
+
+        # Fast forward r steps
+        for _ in range(r):
+            y = _add_mod(_mont_mul(y, y, n, ninv), c_m, n)
+        iteration += r
+
+        k = 0
+        while k < r and d == _ONE and iteration < max_iterations:
+            ys = y
+
+            # Accumulate differences for batch GCD
+            steps = min(batch, r - k)
+            for _ in range(steps):
+                y = _add_mod(_mont_mul(y, y, n, ninv), c_m, n)
+                q = _mont_mul(q, _abs_diff(x, y), n, ninv)
+            iteration += steps
+
+            d = _binary_gcd(q, n)
+            k += batch
+
+        r *= 2
+
+    if d == n:
+        # Backtrack through the last batch one step at a time
+        while True:
+            ys = _add_mod(_mont_mul(ys, ys, n, ninv), c_m, n)
+            d = _binary_gcd(_abs_diff(x, ys), n)
+            if d != _ONE:
+                break
+
+    return d
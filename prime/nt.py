@@ -16,9 +16,28 @@ References:
 - Arithmetic progressions: Green-Tao theorem applications
 """
 
-import random
+import functools
 import math
-from typing import List, Tuple, Union
+import time
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    # Optional compiled uint64 kernels (requires numba)
+    from ._nt_fast import _mr_round as _mr_round_fast
+    from ._nt_fast import _mr_all_bases as _mr_all_bases_fast
+    from ._nt_fast import _pollard_brent_u64 as _pollard_brent_fast
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+try:
+    # Optional GMP-backed modular exponentiation (requires gmpy2)
+    from gmpy2 import mpz, powmod, gcd as _gcd_mpz
+    HAVE_GMPY2 = True
+except ImportError:
+    HAVE_GMPY2 = False
 
 
 # Constants
@@ -37,8 +56,37 @@ SMALL_PRIMES = [
     919, 929, 937, 941, 947, 953, 967, 971, 977, 983, 991, 997
 ]
 
-# Deterministic Miller-Rabin bases for 64-bit integers (Sinclair 2011)
-DETERMINISTIC_BASES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+# Odd small primes paired with their squares for the trial division cutoff
+_ODD_SMALL_PRIMES_SQUARED = tuple((p, p * p) for p in SMALL_PRIMES[1:])
+
+# Small primes as uint64 for vectorized trial division of progression terms
+_SMALL_PRIMES_U64 = np.array(SMALL_PRIMES, dtype=np.uint64)
+
+# Progression terms are sieved in blocks that double up to the maximum, so
+# short runs never pay for sieving terms past their first composite
+_RUN_BLOCK_MIN = 8
+_RUN_BLOCK_MAX = 1024
+
+# GCD batch size for the compiled Pollard-Brent kernel; Montgomery products
+# are cheap enough there that a larger batch than the Python loop pays off
+_RHO_BATCH_FAST = 512
+
+# Wheel of residues modulo 2*3*5*7*11*13 that are coprime to those primes;
+# lets is_prime_64 reject most composites before any modular exponentiation
+_WHEEL_PRIMES = (2, 3, 5, 7, 11, 13)
+_WHEEL_MOD = 30030
+_WHEEL = bytes(
+    1 if all(i % p for p in _WHEEL_PRIMES) or i in _WHEEL_PRIMES else 0
+    for i in range(_WHEEL_MOD)
+)
+
+# Number of is_prime_64 results kept in the LRU cache
+_PRIME_CACHE_SIZE = 1 << 16
+
+# Deterministic Miller-Rabin bases for 64-bit integers (Sinclair 2011);
+# bases are reduced modulo n, so they also cover n below the largest base
+DETERMINISTIC_BASES = [2, 325, 9375, 28178, 450775, 9780504, 1795265022]
+_DETERMINISTIC_BASES_U64 = np.array(DETERMINISTIC_BASES, dtype=np.uint64)
 
 
 def _validate_input(n: Union[int, float], name: str = "n") -> int:
@@ -73,10 +121,39 @@ def _validate_input(n: Union[int, float], name: str = "n") -> int:
     return n
 
 
+def _xorshift64(state: int) -> int:
+    """
+    Advance a xorshift64 generator state (Marsaglia 2003).
+
+    Used instead of the ``random`` module for Miller-Rabin bases and
+    Pollard's Rho constants: each call owns its state, so concurrent
+    requests never contend on the shared Mersenne Twister lock.
+
+    Args:
+        state: Current non-zero 64-bit state
+
+    Returns:
+        Next non-zero 64-bit state, also used as the random draw
+    """
+    state ^= (state << 13) & MAX_64BIT
+    state ^= state >> 7
+    state ^= (state << 17) & MAX_64BIT
+    return state
+
+
+def _xorshift_seed(n: int) -> int:
+    """Per-call non-zero xorshift64 seed derived from the clock."""
+    return ((time.monotonic_ns() ^ id(n)) & MAX_64BIT) or 1
+
+
 def _miller_rabin_test(n: int, base: int) -> bool:
     """
     Perform single Miller-Rabin test with given base.
 
+    Dispatches to the Montgomery-form uint64 kernel in ``prime._nt_fast``
+    when numba is available; otherwise the loop below runs on gmpy2's
+    ``powmod`` when installed, and on stdlib ``pow`` as the last resort.
+
     Args:
         n: Odd integer to test (n >= 3)
         base: Base for Miller-Rabin test
@@ -84,8 +161,13 @@ def _miller_rabin_test(n: int, base: int) -> bool:
     Returns:
         True if n passes the test (possibly prime), False if composite
     """
-    if n <= base:
-        return n == base
+    # A base divisible by n carries no information, so treat it as a pass
+    base %= n
+    if base == 0:
+        return True
+
+    if HAVE_NUMBA:
+        return bool(_mr_round_fast(n, base))
 
     # Write n-1 as d * 2^r
     d = n - 1
@@ -94,14 +176,20 @@ def _miller_rabin_test(n: int, base: int) -> bool:
         d //= 2
         r += 1
 
+    if HAVE_GMPY2:
+        n, base, d = mpz(n), mpz(base), mpz(d)
+        modpow = powmod
+    else:
+        modpow = pow
+
     # Compute base^d mod n
-    x = pow(base, d, n)
+    x = modpow(base, d, n)
     if x == 1 or x == n - 1:
         return True
 
     # Repeat r-1 times
     for _ in range(r - 1):
-        x = pow(x, 2, n)
+        x = modpow(x, 2, n)
         if x == n - 1:
             return True
         if x == 1:
@@ -114,8 +202,9 @@ def is_prime_64(n: Union[int, float]) -> bool:
     """
     Deterministic primality test for 64-bit integers using Miller-Rabin.
 
-    Uses Sinclair's proven base set [2,3,5,7,11,13,17,19,23,29,31,37] which
-    provides 100% deterministic results for all integers up to 2^64.
+    Uses Sinclair's proven base set [2, 325, 9375, 28178, 450775, 9780504,
+    1795265022] which provides 100% deterministic results for all integers
+    up to 2^64 with 7 rounds instead of the 12 needed with prime bases.
 
     Time Complexity: O(log³ n)
     Space Complexity: O(1)
@@ -140,8 +229,17 @@ def is_prime_64(n: Union[int, float]) -> bool:
         >>> is_prime_64(2**61 - 1)  # Large Mersenne prime
         True
     """
-    n = _validate_input(n, "n")
+    return _is_prime_64_cached(_validate_input(n, "n"))
+
+
+@functools.lru_cache(maxsize=_PRIME_CACHE_SIZE)
+def _is_prime_64_cached(n: int) -> bool:
+    """
+    Memoized body of is_prime_64 for an already validated integer.
 
+    Repeated queries for the same n (common for API traffic) are answered
+    from a bounded LRU cache without rerunning Miller-Rabin.
+    """
     # Handle small cases
     if n < 2:
         return False
@@ -151,8 +249,14 @@ def is_prime_64(n: Union[int, float]) -> bool:
         return False
     if n < 9:
         return n in {3, 5, 7}
+    if n >= _WHEEL_MOD and not _WHEEL[n % _WHEEL_MOD]:
+        return False
 
     # Use deterministic Miller-Rabin with proven base set
+    if HAVE_NUMBA:
+        # One compiled call sharing the Montgomery setup across all bases
+        return bool(_mr_all_bases_fast(n, _DETERMINISTIC_BASES_U64))
+
     for base in DETERMINISTIC_BASES:
         if not _miller_rabin_test(n, base):
             return False
@@ -202,49 +306,105 @@ def is_probable_prime(n: Union[int, float], k: int = 20) -> bool:
     if n < 9:
         return n in {3, 5, 7}
 
-    # Perform k rounds of Miller-Rabin with random bases
+    # Perform k rounds of Miller-Rabin with random bases in [2, n - 2]
+    state = _xorshift_seed(n)
     for _ in range(k):
-        base = random.randint(2, n - 2)
+        state = _xorshift64(state)
+        base = 2 + state % (n - 3)
         if not _miller_rabin_test(n, base):
             return False
 
     return True
 
 
-def _trial_division(n: int) -> List[int]:
+def _trial_division(n: int) -> Tuple[List[int], int]:
     """
     Factor out small primes using trial division.
 
     Args:
-        n: Integer to factor
+        n: Integer to factor (n >= 1)
 
     Returns:
-        List of prime factors found, n is modified in place
+        Tuple of (small prime factors found, remaining cofactor)
     """
     factors = []
 
-    # Handle factor 2
-    while n % 2 == 0:
-        factors.append(2)
-        n //= 2
+    # Handle factor 2 with bit operations
+    twos = (n & -n).bit_length() - 1
+    if twos:
+        factors.extend([2] * twos)
+        n >>= twos
 
-    # Handle odd primes up to 1000
-    for p in SMALL_PRIMES[1:]:  # Skip 2, already handled
-        if p * p > n:
+    # Handle odd primes up to 1000, one divmod per division attempt
+    for p, p_squared in _ODD_SMALL_PRIMES_SQUARED:
+        if p_squared > n:
             break
-        while n % p == 0:
+        q, r = divmod(n, p)
+        while r == 0:
             factors.append(p)
-            n //= p
+            n = q
+            q, r = divmod(n, p)
+        if n == 1:
+            break
 
     return factors, n
 
 
+def _iroot(n: int, k: int) -> int:
+    """
+    Integer k-th root: the largest r with r**k <= n, for n >= 1 and k >= 1.
+
+    Uses exact integer binary search, so it stays correct above 2^53 where
+    float roots like n ** (1/k) lose precision.
+    """
+    lo, hi = 1, 1 << ((n.bit_length() + k - 1) // k)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if mid ** k <= n:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _perfect_power(n: int,
+                   max_exp: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """
+    Detect whether n is a perfect power root**exp with exp >= 2.
+
+    Only prime exponents are tried; a composite exponent is found as a
+    prime exponent of a root that is itself a perfect power.
+
+    Args:
+        n: Integer to test (n >= 2)
+        max_exp: Largest exponent worth trying, when the caller knows a lower
+            bound on the root; defaults to n.bit_length()
+
+    Returns:
+        (root, exp) for the smallest prime exp with root**exp == n, or None
+    """
+    if max_exp is None:
+        max_exp = n.bit_length()
+
+    for exp in SMALL_PRIMES:
+        if exp > max_exp:
+            break
+        root = _iroot(n, exp)
+        if root < 2:
+            break
+        if root ** exp == n:
+            return root, exp
+    return None
+
+
 def _pollard_rho_brent(n: int, max_iterations: int = 100000) -> int:
     """
     Pollard's Rho algorithm with Brent's cycle detection optimization.
 
     Brent's method is more efficient than Floyd's tortoise-and-hare approach
-    for cycle detection in the pseudorandom sequence.
+    for cycle detection in the pseudorandom sequence. Each attempt runs in
+    the Montgomery-form kernel from ``prime._nt_fast`` when numba is
+    available; this function only picks the random constants and retries.
 
     Args:
         n: Composite number to factor
@@ -257,9 +417,19 @@ def _pollard_rho_brent(n: int, max_iterations: int = 100000) -> int:
         return 2
 
     # Try multiple random starting points
+    state = _xorshift_seed(n)
     for _ in range(10):  # Up to 10 attempts with different constants
-        x = random.randint(2, n - 2)
-        c = random.randint(1, n - 1)
+        state = _xorshift64(state)
+        x = 2 + state % (n - 3)  # in [2, n - 2]
+        state = _xorshift64(state)
+        c = 1 + state % (n - 1)  # in [1, n - 1]
+
+        if HAVE_NUMBA:
+            d = int(_pollard_brent_fast(n, x, c, _RHO_BATCH_FAST, max_iterations))
+            if 1 < d < n:
+                return d
+            continue
+
         y = x
         d = 1
         q = 1
@@ -286,7 +456,7 @@ def _pollard_rho_brent(n: int, max_iterations: int = 100000) -> int:
                     q = (q * abs(x - y)) % n
                     iteration += 1
 
-                d = math.gcd(q, n)
+                d = int(_gcd_mpz(q, n)) if HAVE_GMPY2 else math.gcd(q, n)
                 k += 128
 
             r *= 2
@@ -297,6 +467,44 @@ def _pollard_rho_brent(n: int, max_iterations: int = 100000) -> int:
     return n  # Failed to find factor
 
 
+def _factor_large(n: int, factors: List[int]) -> None:
+    """
+    Recursively factor a number that has no prime factors in SMALL_PRIMES.
+
+    Args:
+        n: Integer to factor, already stripped of small prime factors
+        factors: List that prime factors are appended to
+    """
+    if n == 1:
+        return
+
+    # is_prime_64 is LRU-cached, so factors Pollard's Rho returns repeatedly
+    # are only tested once
+    if is_prime_64(n):
+        factors.append(n)
+        return
+
+    # Pollard's Rho handles prime powers poorly, so split them directly. With
+    # no prime factor below 1000 the root is > 2^9.97, bounding the exponent
+    power = _perfect_power(n, n.bit_length() // 10)
+    if power is not None:
+        root, exp = power
+        root_factors: List[int] = []
+        _factor_large(root, root_factors)
+        factors.extend(root_factors * exp)
+        return
+
+    factor = _pollard_rho_brent(n)
+
+    if factor == n:
+        # Pollard's Rho failed, treat as prime (very rare)
+        factors.append(n)
+        return
+
+    _factor_large(factor, factors)
+    _factor_large(n // factor, factors)
+
+
 def factorize(n: Union[int, float]) -> List[int]:
     """
     Hybrid integer factorization using trial division and Pollard's Rho.
@@ -334,38 +542,31 @@ def factorize(n: Union[int, float]) -> List[int]:
     if n <= 1:
         return []
 
-    all_factors = []
-    stack = [n]
-
-    while stack:
-        current = stack.pop()
+    # Trial division runs once; every factor split off the remainder later
+    # is free of small primes as well
+    all_factors, remainder = _trial_division(n)
+    _factor_large(remainder, all_factors)
 
-        if current == 1:
-            continue
-
-        # Try trial division first
-        small_factors, remainder = _trial_division(current)
-        all_factors.extend(small_factors)
-
-        if remainder == 1:
-            continue
+    return sorted(all_factors)
 
-        # Check if remainder is prime
-        if is_prime_64(remainder):
-            all_factors.append(remainder)
-            continue
 
-        # Use Pollard's Rho for composite remainder
-        factor = _pollard_rho_brent(remainder)
+def _small_prime_mask(candidates: np.ndarray) -> np.ndarray:
+    """
+    Vectorized trial division of uint64 candidates by SMALL_PRIMES.
 
-        if factor == remainder:
-            # Pollard's Rho failed, treat as prime (very rare)
-            all_factors.append(remainder)
-        else:
-            # Found a factor, add both parts to stack
-            stack.extend([factor, remainder // factor])
+    Args:
+        candidates: 1-D uint64 array of integers to test
 
-    return sorted(all_factors)
+    Returns:
+        Boolean array, False where a candidate is certainly composite (or 0).
+        Candidates up to the largest small prime are always kept, leaving
+        the exact answer to is_prime_64.
+    """
+    residues = candidates[:, None] % _SMALL_PRIMES_U64
+    keep: np.ndarray = (residues != 0).all(axis=1) | (
+        candidates <= _SMALL_PRIMES_U64[-1]
+    )
+    return keep
 
 
 def prime_run_length(start: Union[int, float], diff: Union[int, float],
@@ -394,12 +595,14 @@ def prime_run_length(start: Union[int, float], diff: Union[int, float],
         ValueError: If start is negative, diff <= 0, or inputs exceed 64-bit range
 
     Examples:
-        >>> prime_run_length(3, 2)  # 3, 5, 7, 11, 13 (stops at 15=3*5)
-        (5, [3, 5, 7, 11, 13])
+        >>> prime_run_length(3, 2)  # 3, 5, 7 (stops at 9=3*3)
+        (3, [3, 5, 7])
         >>> prime_run_length(5, 6)  # 5, 11, 17, 23, 29 (stops at 35=5*7)
         (5, [5, 11, 17, 23, 29])
-        >>> prime_run_length(7, 30)  # Famous long arithmetic progression
-        (12, [7, 37, 67, 97, 127, 157, 187, 217, 247, 277, 307, 337])
+        >>> prime_run_length(7, 30)  # 7, ..., 157 (stops at 187=11*17)
+        (6, [7, 37, 67, 97, 127, 157])
+        >>> prime_run_length(7, 150)  # 7, ..., 907 (stops at 1057=7*151)
+        (7, [7, 157, 307, 457, 607, 757, 907])
     """
     start = _validate_input(start, "start")
     diff = _validate_input(diff, "diff")
@@ -410,27 +613,30 @@ def prime_run_length(start: Union[int, float], diff: Union[int, float],
     if not isinstance(max_terms, int) or max_terms < 1:
         raise ValueError(f"max_terms must be a positive integer, got {max_terms}")
 
-    primes = []
-    current = start
+    # Only terms that stay within 64 bits can be part of the run
+    n_terms = min(max_terms, (MAX_64BIT - start) // diff + 1)
+    candidates = (np.arange(n_terms, dtype=np.uint64) * np.uint64(diff)
+                  + np.uint64(start))
 
-    for i in range(max_terms):
-        # Check for 64-bit overflow before computing next term
-        if current > MAX_64BIT:
-            break
+    # The run is always a prefix of candidates, so the primes stay in the
+    # uint64 buffer and are only boxed into a list once at the end
+    count = 0
+    block = _RUN_BLOCK_MIN
 
-        if is_prime_64(current):
-            primes.append(current)
+    while count < n_terms:
+        chunk = candidates[count:count + block]
+        alive = _small_prime_mask(chunk)
 
-            # Check if next term would overflow
-            if current > MAX_64BIT - diff:
-                break
+        for current, survived in zip(chunk.tolist(), alive.tolist(), strict=True):
+            # Small-prime sieve rejects most composites without Miller-Rabin
+            if not survived or not is_prime_64(current):
+                # Found first composite, stop the run
+                return count, candidates[:count].tolist()
+            count += 1
 
-            current += diff
-        else:
-            # Found first composite, stop the run
-            break
+        block = min(block * 2, _RUN_BLOCK_MAX)
 
-    return len(primes), primes
+    return count, candidates[:count].tolist()
 
 
 # Utility functions for testing and verification
@@ -441,19 +647,6 @@ def _gcd(a: int, b: int) -> int:
     return a
 
 
-def _is_perfect_power(n: int) -> bool:
-    """Check if n is a perfect power (for factorization optimization)."""
-    if n <= 1:
-        return True
-
-    for exp in range(2, int(math.log2(n)) + 1):
-        root = int(n ** (1/exp))
-        for candidate in [root - 1, root, root + 1]:
-            if candidate > 1 and candidate ** exp == n:
-                return True
-    return False
-
-
 if __name__ == "__main__":
     # Basic tests and demonstrations
     print("Prime Number Theory Module - Basic Tests")
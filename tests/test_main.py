@@ -54,4 +54,102 @@ def test_openapi_spec():
 def test_nonexistent_endpoint():
     """Test that non-existent endpoints return 404."""
     response = client.get("/nonexistent")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+
+def test_factor_large_semiprime():
+    """Test factorization above the process pool threshold."""
+    n = 4294967291 * 4294967279
+    response = client.get(f"/factor/{n}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["factors"] == [4294967279, 4294967291]
+    assert data["factor_count"] == 2
+
+
+def test_prime_rejects_out_of_range():
+    """Test path validation rejects values outside the 64-bit range."""
+    assert client.get("/prime/-1").status_code == 422
+    assert client.get(f"/prime/{2**64}").status_code == 422
+    assert client.get(f"/prime/{2**64 - 1}").status_code == 200
+
+
+def test_prime_cache_headers_and_not_modified():
+    """Test pure-function endpoints send ETags and honour If-None-Match."""
+    response = client.get("/prime/97")
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"61"'
+    assert "immutable" in response.headers["cache-control"]
+
+    response = client.get("/prime/97", headers={"If-None-Match": '"61"'})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_factor_binary_format():
+    """Test factors can be returned as packed little-endian uint64 values."""
+    response = client.get("/factor/60", params={"format": "binary"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.headers["etag"] == '"3c-bin"'
+    assert response.content == b"".join(
+        p.to_bytes(8, "little") for p in (2, 2, 3, 5)
+    )
+
+
+def test_factor_recovers_from_broken_process_pool(monkeypatch):
+    """Test a dead process pool is discarded instead of failing every request."""
+    import app.main as main
+    from concurrent.futures.process import BrokenProcessPool
+
+    class DeadPool:
+        def submit(self, *args, **kwargs):
+            raise BrokenProcessPool("child terminated")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    pool = DeadPool()
+    monkeypatch.setattr(main, "HAVE_NUMBA", False)
+    monkeypatch.setattr(main, "_process_pool", pool)
+    monkeypatch.setattr(main, "_get_process_pool", lambda: main._process_pool or pool)
+
+    response = client.get(f"/factor/{4294967291 * 4294967279}")
+    assert response.status_code == 200
+    assert response.json()["factors"] == [4294967279, 4294967291]
+    assert main._process_pool is None
+
+
+def test_progression_cache_headers_and_not_modified():
+    """Test progression ETags encode every input and honour If-None-Match."""
+    response = client.get("/progression/5/6", params={"max_terms": 3})
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"5-6-3"'
+    assert "immutable" in response.headers["cache-control"]
+
+    response = client.get(
+        "/progression/5/6",
+        params={"max_terms": 3},
+        headers={"If-None-Match": '"5-6-3"'},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_progression_etag_depends_on_max_terms():
+    """Test a different max_terms is not served from a cached tag."""
+    response = client.get(
+        "/progression/5/6",
+        params={"max_terms": 4},
+        headers={"If-None-Match": '"5-6-3"'},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"5-6-4"'
+
+
+def test_progression_rejects_invalid_parameters():
+    """Test path and query validation on the progression endpoint."""
+    assert client.get("/progression/5/0").status_code == 422
+    assert client.get("/progression/5/6?max_terms=0").status_code == 422
+    assert client.get("/progression/5/6?max_terms=10001").status_code == 422
+    assert client.get("/progression/5/6?max_terms=10000").status_code == 200
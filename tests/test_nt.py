@@ -0,0 +1,105 @@
+"""Tests for the number theory module."""
+
+import random
+
+import pytest
+
+from prime import nt
+
+
+def _reference_miller_rabin(n: int, base: int) -> bool:
+    """Plain stdlib Miller-Rabin round used as an oracle."""
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(r - 1):
+        x = pow(x, 2, n)
+        if x == n - 1:
+            return True
+        if x == 1:
+            return False
+    return False
+
+
+def test_is_prime_64_known_values():
+    """Test primality of small and large known values."""
+    assert [n for n in range(30) if nt.is_prime_64(n)] == [
+        2, 3, 5, 7, 11, 13, 17, 19, 23, 29
+    ]
+    assert nt.is_prime_64(2**61 - 1)
+    assert nt.is_prime_64(2**64 - 59)
+    assert not nt.is_prime_64(2**64 - 1)
+
+
+def test_is_prime_64_rejects_strong_pseudoprimes():
+    """Test composites that fool small prime bases are still rejected."""
+    assert not nt.is_prime_64(2047)  # spsp(2)
+    assert not nt.is_prime_64(3215031751)  # spsp(2, 3, 5, 7)
+    assert not nt.is_prime_64(3825123056546413051)  # spsp(2, ..., 23)
+
+
+def test_is_probable_prime_known_values():
+    """Test random-base Miller-Rabin agrees with the deterministic test."""
+    for n in range(2000):
+        assert nt.is_probable_prime(n) == nt.is_prime_64(n), n
+    for spsp in (2047, 3215031751, 3825123056546413051):
+        assert not nt.is_probable_prime(spsp)
+    assert nt.is_probable_prime(2**61 - 1)
+    assert nt.is_probable_prime(2**64 - 59)
+
+
+def test_fast_miller_rabin_matches_reference():
+    """Test the compiled kernel agrees with stdlib pow on 64-bit inputs."""
+    fast = pytest.importorskip("prime._nt_fast")
+    rng = random.Random(12345)
+    for _ in range(2000):
+        n = rng.randrange(3, 2**64, 2)
+        base = rng.randrange(2, n - 1)
+        assert fast._mr_round(n, base) == _reference_miller_rabin(n, base)
+
+
+@pytest.mark.parametrize("have_gmpy2", [True, False])
+def test_pure_python_fallbacks(monkeypatch, have_gmpy2):
+    """Test the gmpy2 and stdlib paths used when numba is unavailable."""
+    if have_gmpy2 and not nt.HAVE_GMPY2:
+        pytest.skip("gmpy2 not installed")
+    monkeypatch.setattr(nt, "HAVE_NUMBA", False)
+    monkeypatch.setattr(nt, "HAVE_GMPY2", have_gmpy2)
+    nt._is_prime_64_cached.cache_clear()
+    try:
+        assert [n for n in range(30) if nt.is_prime_64(n)] == [
+            2, 3, 5, 7, 11, 13, 17, 19, 23, 29
+        ]
+        assert nt.is_prime_64(2**64 - 59)
+        assert not nt.is_prime_64(3825123056546413051)
+        assert nt.factorize(4294967291 * 4294967279) == [4294967279, 4294967291]
+        assert nt.is_probable_prime(2**61 - 1)
+        assert not nt.is_probable_prime(3215031751)
+    finally:
+        nt._is_prime_64_cached.cache_clear()
+
+
+def test_prime_run_length_stops_at_first_composite():
+    """Test runs end at the first composite and never leave 64-bit range."""
+    assert nt.prime_run_length(3, 2) == (3, [3, 5, 7])
+    assert nt.prime_run_length(7, 150, 10) == (
+        7, [7, 157, 307, 457, 607, 757, 907]
+    )
+    assert nt.prime_run_length(2**64 - 59, 2) == (1, [2**64 - 59])
+
+
+def test_factorize_large_semiprime():
+    """Test Pollard-Rho recovers both 32-bit factors of a 64-bit semiprime."""
+    assert nt.factorize(4294967291 * 4294967279) == [4294967279, 4294967291]
+    assert nt.factorize(2**64 - 1) == [3, 5, 17, 257, 641, 65537, 6700417]
+
+
+def test_factorize_prime_powers():
+    """Test prime powers above 2^53 are split by exact integer roots."""
+    assert nt.factorize(4294967291**2) == [4294967291, 4294967291]
+    assert nt.factorize(65521**4) == [65521] * 4
+    assert nt._perfect_power(2**64 - 1) is None